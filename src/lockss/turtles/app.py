@@ -28,11 +28,12 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import concurrent.futures
+import functools
 import importlib.resources
+import os
 from pathlib import Path
 
-import xdg
-
 from lockss.turtles.plugin import Plugin
 from lockss.turtles.plugin_registry import PluginRegistry, PluginRegistryCatalog
 from lockss.turtles.plugin_set import PluginSet, PluginSetCatalog
@@ -42,14 +43,6 @@ from lockss.turtles.util import _load_and_validate, _path
 
 class TurtlesApp(object):
 
-    XDG_CONFIG_DIR = xdg.xdg_config_home().joinpath(__package__)
-
-    USR_CONFIG_DIR = Path('/usr/local/share', __package__)
-
-    ETC_CONFIG_DIR = Path('/etc', __package__)
-
-    CONFIG_DIRS = [XDG_CONFIG_DIR, USR_CONFIG_DIR, ETC_CONFIG_DIR]
-
     PLUGIN_REGISTRY_CATALOG = 'plugin-registry-catalog.yaml'
 
     PLUGIN_SET_CATALOG = 'plugin-set-catalog.yaml'
@@ -58,9 +51,20 @@ class TurtlesApp(object):
 
     PLUGIN_SIGNING_CREDENTIALS_SCHEMA = 'plugin-signing-credentials-schema.json'
 
+    # Deferred (and then computed only once) so that importing this module, or
+    # running a command that needs no configuration, does no path resolution
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def config_dirs():
+        import xdg
+        return [xdg.xdg_config_home().joinpath(__package__),
+                Path('/usr/local/share', __package__),
+                Path('/etc', __package__)]
+
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def _default_files(file_str):
-        return [dir_path.joinpath(file_str) for dir_path in TurtlesApp.CONFIG_DIRS]
+        return [dir_path.joinpath(file_str) for dir_path in TurtlesApp.config_dirs()]
 
     @staticmethod
     def _select_file(file_str, preselected=None):
@@ -79,12 +83,18 @@ class TurtlesApp(object):
         super().__init__()
         self._password = None
         self._plugin_registries = None
+        self._plugin_set_index = dict()
         self._plugin_sets = None
         self._plugin_signing_credentials = None
 
     # Returns plugin_id -> (set_id, jar_path, plugin)
     def build_plugin(self, plugin_ids):
-        return {plugin_id: self._build_one_plugin(plugin_id) for plugin_id in plugin_ids}
+        plugin_ids = list(dict.fromkeys(plugin_ids))  # dedup, preserving order
+        if len(plugin_ids) < 2:
+            return {plugin_id: self._build_one_plugin(plugin_id) for plugin_id in plugin_ids}
+        # Independent builds mostly wait on subprocess I/O, so threads suffice
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(plugin_ids), os.cpu_count() or 1)) as executor:
+            return dict(zip(plugin_ids, executor.map(self._build_one_plugin, plugin_ids)))
 
     def default_plugin_registry_catalogs(self):
         return TurtlesApp._default_files(TurtlesApp.PLUGIN_REGISTRY_CATALOG)
@@ -98,10 +108,16 @@ class TurtlesApp(object):
     # Returns (src_path, plugin_id) -> list of (registry_id, layer_id, dst_path, plugin)
     def deploy_plugin(self, src_paths, layer_ids, interactive=False):
         plugin_ids = [Plugin.id_from_jar(src_path) for src_path in src_paths]
-        return {(src_path, plugin_id): self._deploy_one_plugin(src_path,
-                                                               plugin_id,
-                                                               layer_ids,
-                                                               interactive=interactive) for src_path, plugin_id in zip(src_paths, plugin_ids)}
+        pairs = list(zip(src_paths, plugin_ids))
+        # Sequential when interactive so prompts are not interleaved
+        if interactive or len(pairs) < 2:
+            return {(src_path, plugin_id): self._deploy_one_plugin(src_path,
+                                                                   plugin_id,
+                                                                   layer_ids,
+                                                                   interactive=interactive) for src_path, plugin_id in pairs}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(pairs), os.cpu_count() or 1)) as executor:
+            results = executor.map(lambda pair: self._deploy_one_plugin(pair[0], pair[1], layer_ids), pairs)
+            return dict(zip(pairs, results))
 
     def load_plugin_registries(self, plugin_registry_catalog_path=None):
         if self._plugin_registries is None:
@@ -148,28 +164,41 @@ class TurtlesApp(object):
 
     # Returns (set_id, jar_path, plugin)
     def _build_one_plugin(self, plugin_id):
-        for plugin_set in self._plugin_sets:
-            if plugin_set.has_plugin(plugin_id):
-                return (plugin_set.get_id(),
-                        *plugin_set.build_plugin(plugin_id,
-                                                 self._get_plugin_signing_keystore(),
-                                                 self._get_plugin_signing_alias(),
-                                                 self._get_plugin_signing_password()))
-        raise Exception(f'{plugin_id}: not found in any plugin set')
+        plugin_set = self._find_plugin_set(plugin_id)
+        return (plugin_set.get_id(),
+                *plugin_set.build_plugin(plugin_id,
+                                         self._get_plugin_signing_keystore(),
+                                         self._get_plugin_signing_alias(),
+                                         self._get_plugin_signing_password()))
+
+    def _find_plugin_set(self, plugin_id):
+        plugin_set = self._plugin_set_index.get(plugin_id)
+        if plugin_set is None:
+            for candidate in self._plugin_sets:
+                if candidate.has_plugin(plugin_id):
+                    plugin_set = self._plugin_set_index[plugin_id] = candidate
+                    break
+            else:
+                raise Exception(f'{plugin_id}: not found in any plugin set')
+        return plugin_set
 
     # Returns list of (registry_id, layer_id, dst_path, plugin)
     def _deploy_one_plugin(self, src_jar, plugin_id, layer_ids, interactive=False):
         ret = list()
+        plugin = None
         for plugin_registry in self._plugin_registries:
             if plugin_registry.has_plugin(plugin_id):
                 for layer_id in layer_ids:
                     layer = plugin_registry.get_layer(layer_id)
                     if layer is not None:
+                        if plugin is None:
+                            plugin = Plugin.from_jar(src_jar)  # parse the JAR once for all layers
                         ret.append((plugin_registry.get_id(),
                                     layer.get_id(),
                                     *layer.deploy_plugin(plugin_id,
                                                          src_jar,
-                                                         interactive=interactive)))
+                                                         interactive=interactive,
+                                                         plugin=plugin)))
         if len(ret) == 0:
             raise Exception(f'{src_jar}: {plugin_id} not declared in any plugin registry')
         return ret
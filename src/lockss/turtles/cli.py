@@ -28,14 +28,9 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
-import argparse
-import getpass
 from pathlib import Path
 import sys
 
-import rich_argparse
-import tabulate
-
 import lockss.turtles
 from lockss.turtles.app import TurtlesApp
 from lockss.turtles.plugin_registry import PluginRegistryLayer
@@ -43,12 +38,14 @@ from lockss.turtles.util import _path
 
 
 def _file_lines(path):
-    f = None
+    f = open(_path(path), 'r') if path != '-' else sys.stdin
     try:
-        f = open(_path(path), 'r') if path != '-' else sys.stdin
-        return [line for line in [line.partition('#')[0].strip() for line in f] if len(line) > 0]
+        for line in f:
+            line = line.partition('#')[0].strip()
+            if len(line) > 0:
+                yield line
     finally:
-        if f is not None and path != '-':
+        if path != '-':
             f.close()
 
 
@@ -56,6 +53,14 @@ class TurtlesCli(object):
 
     PROG = 'turtles'
 
+    COMMANDS = frozenset(['build-plugin', 'bp',
+                          'copyright',
+                          'deploy-plugin', 'dp',
+                          'license',
+                          'release-plugin', 'rp',
+                          'usage',
+                          'version'])
+
     def __init__(self):
         super().__init__()
         self._app = TurtlesApp()
@@ -64,9 +69,16 @@ class TurtlesCli(object):
         self._jars = None
         self._layers = None
         self._parser = None
+        self._selected_command = None
         self._subparsers = None
 
     def run(self):
+        # Fast path for print-and-exit commands: skip parser construction entirely
+        if len(sys.argv) == 2 and sys.argv[1] in ('copyright', 'license', 'version'):
+            sys.stdout.write({'copyright': lockss.turtles.__copyright__,
+                              'license': lockss.turtles.__license__,
+                              'version': lockss.turtles.__version__}[sys.argv[1]] + '\n')
+            return
         self._make_parser()
         self._args = self._parser.parse_args()
         if self._args.debug_cli:
@@ -132,6 +144,7 @@ class TurtlesCli(object):
     #         self._tabulate(title, result, headers)
 
     def _build_plugin(self):
+        import tabulate
         # Prerequisites
         self._app.load_plugin_sets(self._args.plugin_set_catalog)
         self._app.load_plugin_signing_credentials(self._args.plugin_signing_credentials)
@@ -148,6 +161,7 @@ class TurtlesCli(object):
         print(lockss.turtles.__copyright__)
 
     def _deploy_plugin(self):
+        import tabulate
         # Prerequisites
         self._app.load_plugin_registries(self._args.plugin_registry_catalog)
         # Action
@@ -207,6 +221,7 @@ class TurtlesCli(object):
                                help='disallow interactive prompts (default: allow)')
 
     def _make_option_output_format(self, container):
+        import tabulate
         container.add_argument('--output-format',
                                metavar='FMT',
                                choices=tabulate.tabulate_formats,
@@ -236,20 +251,6 @@ class TurtlesCli(object):
                                type=Path,
                                help=f'load plugin signing credentials from %(metavar)s (default: {" or ".join(map(str, self._app.default_plugin_signing_credentials()))})')
 
-    def _make_option_production(self, container):
-        container.add_argument('--production', '-p',
-                               dest='layer',
-                               action='append_const',
-                               const=PluginRegistryLayer.PRODUCTION,
-                               help="synonym for --layer=%(const)s (i.e. add '%(const)s' to the list of plugin registry layers to process)")
-
-    def _make_option_testing(self, container):
-        container.add_argument('--testing', '-t',
-                               dest='layer',
-                               action='append_const',
-                               const=PluginRegistryLayer.TESTING,
-                               help="synonym for --layer=%(const)s (i.e. add '%(const)s' to the list of plugin registry layers to process)")
-
     def _make_options_identifiers(self, container):
         group = container.add_argument_group(title='plugin identifier arguments and options')
         group.add_argument('--identifier', '-i',
@@ -285,6 +286,16 @@ class TurtlesCli(object):
                            nargs='*',
                            help='plugin JAR to deploy')
 
+    # One synonym option per well-known layer, driven by a single table
+    def _make_options_layer_synonyms(self, container):
+        for option, short_option, layer_id in [('--production', '-p', PluginRegistryLayer.PRODUCTION),
+                                               ('--testing', '-t', PluginRegistryLayer.TESTING)]:
+            container.add_argument(option, short_option,
+                                   dest='layer',
+                                   action='append_const',
+                                   const=layer_id,
+                                   help="synonym for --layer=%(const)s (i.e. add '%(const)s' to the list of plugin registry layers to process)")
+
     def _make_options_layers(self, container):
         group = container.add_argument_group(title='plugin registry layer options')
         group.add_argument('--layer', '-l',
@@ -299,6 +310,10 @@ class TurtlesCli(object):
                            help='add the layers in %(metavar)s to the list of plugin registry layers to process')
 
     def _make_parser(self):
+        # Deferred imports: keep argparse/rich_argparse off the fast path
+        import argparse
+        import rich_argparse
+        self._selected_command = self._peek_command()
         for cls in [rich_argparse.RichHelpFormatter]:
             cls.styles.update({
                 'argparse.args': f'bold {cls.styles["argparse.args"]}',
@@ -340,6 +355,8 @@ class TurtlesCli(object):
                                       help='build (package and sign) plugins',
                                       formatter_class=self._parser.formatter_class)
         parser.set_defaults(fun=self._build_plugin)
+        if not self._should_populate('build-plugin', 'bp'):
+            return
         self._make_option_output_format(parser)
         self._make_option_password(parser)
         self._make_option_plugin_set_catalog(parser)
@@ -359,10 +376,11 @@ class TurtlesCli(object):
                                       help='deploy plugins',
                                       formatter_class=self._parser.formatter_class)
         parser.set_defaults(fun=self._deploy_plugin)
+        if not self._should_populate('deploy-plugin', 'dp'):
+            return
         self._make_option_output_format(parser)
         self._make_option_plugin_registry_catalog(parser)
-        self._make_option_production(parser)
-        self._make_option_testing(parser)
+        self._make_options_layer_synonyms(parser)
         self._make_options_jars(parser)
         self._make_options_layers(parser)
 
@@ -379,13 +397,14 @@ class TurtlesCli(object):
                                       help='release (build and deploy) plugins',
                                       formatter_class=self._parser.formatter_class)
         parser.set_defaults(fun=self._release_plugin)
+        if not self._should_populate('release-plugin', 'rp'):
+            return
         self._make_option_output_format(parser)
         self._make_option_password(parser)
         self._make_option_plugin_registry_catalog(parser)
         self._make_option_plugin_set_catalog(parser)
         self._make_option_plugin_signing_credentials(parser)
-        self._make_option_production(parser)
-        self._make_option_testing(parser)
+        self._make_options_layer_synonyms(parser)
         self._make_options_identifiers(parser)
         self._make_options_layers(parser)
 
@@ -404,6 +423,7 @@ class TurtlesCli(object):
         parser.set_defaults(fun=self._version)
 
     def _obtain_password(self):
+        import getpass
         if self._args.password is not None:
             _p = self._args.password
         elif self._args.interactive:
@@ -412,7 +432,16 @@ class TurtlesCli(object):
             self._parser.error('no plugin signing password specified while in non-interactive mode')
         self._app.set_password(lambda: _p)
 
+    # Returns the command word from the command line, or None if there is none
+    # (e.g. -h alone, or a typo that parse_args will reject anyway)
+    def _peek_command(self):
+        for arg in sys.argv[1:]:
+            if arg in TurtlesCli.COMMANDS:
+                return arg
+        return None
+
     def _release_plugin(self):
+        import tabulate
         # Prerequisites
         self._app.load_plugin_sets(self._args.plugin_set_catalog)
         self._app.load_plugin_registries(self._args.plugin_registry_catalog)
@@ -428,6 +457,14 @@ class TurtlesCli(object):
                                 headers=['Plugin identifier', 'Plugin version', 'Plugin registry', 'Plugin registry layer', 'Deployed JAR'],
                                 tablefmt=self._args.output_format))
 
+    # A subcommand's options are only built when that subcommand was selected
+    # on the command line, or for 'usage', which formats every subparser.
+    # With no recognizable subcommand (e.g. top-level -h, or a typo argparse
+    # will reject) nothing is built: top-level help only reads the skeleton
+    # entries' description column
+    def _should_populate(self, *names):
+        return self._selected_command == 'usage' or self._selected_command in names
+
     def _usage(self):
         self._parser.print_usage()
         print()
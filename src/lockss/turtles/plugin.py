@@ -28,31 +28,65 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import functools
+import io
 from pathlib import Path
-import xml.etree.ElementTree
-import zipfile
-
-import java_manifest
 
 from lockss.turtles.util import _path
 
 
+# Process-wide caches of parsed plugins (one for plugin XML files, one for
+# plugins read out of JARs), shared across plugin sets so parents imported
+# from several sets parse once; keyed by (path, mtime, size) so a file
+# rewritten mid-run is never served stale
+_PLUGIN_CACHE = dict()
+
+_JAR_PLUGIN_CACHE = dict()
+
+_JAR_ID_CACHE = dict()
+
+
 class Plugin(object):
 
+    __slots__ = ('_entries', '_path')
+
     @staticmethod
     def from_jar(jar_path):
+        import zipfile
         jar_path = _path(jar_path)  # in case it's a string
-        plugin_id = Plugin.id_from_jar(jar_path)
-        plugin_fstr = str(Plugin.id_to_file(plugin_id))
-        with zipfile.ZipFile(jar_path, 'r') as zip_file:
-            with zip_file.open(plugin_fstr, 'r') as plugin_file:
-                return Plugin(plugin_file, plugin_fstr)
+        key = Plugin._cache_key(jar_path)
+        plugin = _JAR_PLUGIN_CACHE.get(key)
+        if plugin is None:
+            # Single zip open: manifest and plugin XML come from the same handle
+            with zipfile.ZipFile(jar_path, 'r') as zip_file:
+                manifest = Plugin._parse_manifest(zip_file.read('META-INF/MANIFEST.MF').decode('utf-8'))
+                plugin_id = Plugin._id_from_manifest(manifest, jar_path)
+                plugin_fstr = str(Plugin.id_to_file(plugin_id))
+                plugin = _JAR_PLUGIN_CACHE[key] = Plugin(io.BytesIO(zip_file.read(plugin_fstr)), plugin_fstr)
+        return plugin
 
     @staticmethod
     def from_path(path):
+        import mmap
         path = _path(path)  # in case it's a string
-        with open(path, 'r') as input_file:
-            return Plugin(input_file, path)
+        key = Plugin._cache_key(path)
+        plugin = _PLUGIN_CACHE.get(key)
+        if plugin is None:
+            # Feed the parser straight from the page cache instead of copying
+            # the file into a Python buffer first
+            with path.open('rb') as f:
+                try:
+                    buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:  # zero-length files cannot be mapped
+                    buf = io.BytesIO(f.read())
+                with buf:
+                    plugin = _PLUGIN_CACHE[key] = Plugin(buf, path)
+        return plugin
+
+    @staticmethod
+    def _cache_key(path):
+        st = path.stat()
+        return (str(path), st.st_mtime_ns, st.st_size)
 
     @staticmethod
     def file_to_id(plugin_fstr):
@@ -60,8 +94,18 @@ class Plugin(object):
 
     @staticmethod
     def id_from_jar(jar_path):
+        import zipfile
         jar_path = _path(jar_path)  # in case it's a string
-        manifest = java_manifest.from_jar(jar_path)
+        key = Plugin._cache_key(jar_path)
+        plugin_id = _JAR_ID_CACHE.get(key)
+        if plugin_id is None:
+            with zipfile.ZipFile(jar_path, 'r') as zip_file:
+                manifest = Plugin._parse_manifest(zip_file.read('META-INF/MANIFEST.MF').decode('utf-8'))
+            plugin_id = _JAR_ID_CACHE[key] = Plugin._id_from_manifest(manifest, jar_path)
+        return plugin_id
+
+    @staticmethod
+    def _id_from_manifest(manifest, jar_path):
         for entry in manifest:
             if entry.get('Lockss-Plugin') == 'true':
                 name = entry.get('Name')
@@ -71,25 +115,70 @@ class Plugin(object):
         else:
             raise Exception(f'{jar_path!s}: no Lockss-Plugin entry in META-INF/MANIFEST.MF')
 
+    # Returns the manifest as a list of sections, each a dict of headers.
+    # Only the small subset of the JAR manifest format this tool reads is
+    # supported: "Name: value" headers, continuation lines beginning with a
+    # space, and blank lines separating sections.
+    @staticmethod
+    def _parse_manifest(manifest_str):
+        sections = list()
+        current = dict()
+        last_key = None
+        for line in manifest_str.splitlines():
+            if len(line) == 0:
+                if len(current) > 0:
+                    sections.append(current)
+                    current = dict()
+                last_key = None
+            elif line.startswith(' '):
+                if last_key is not None:
+                    current[last_key] += line[1:]
+            elif ':' in line:
+                key, value = line.split(':', 1)
+                last_key = key
+                current[key] = value[1:] if value.startswith(' ') else value
+        if len(current) > 0:
+            sections.append(current)
+        return sections
+
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def id_to_dir(plugin_id):
         return Plugin.id_to_file(plugin_id).parent
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def id_to_file(plugin_id):
         return Path(f'{plugin_id.replace(".", "/")}.xml')
 
     def __init__(self, plugin_file, plugin_path):
+        parser_kwargs = dict()
+        try:
+            from lxml import etree  # C-backed tree construction when available
+            # Unlike stock ElementTree, lxml keeps comments and processing
+            # instructions as tree nodes; drop them so indexing an entry's
+            # children by position behaves the same with either parser
+            parser_kwargs.update(remove_comments=True, remove_pis=True)
+        except ImportError:
+            import xml.etree.ElementTree as etree
         super().__init__()
         self._path = plugin_path
-        self._parsed = xml.etree.ElementTree.parse(plugin_file).getroot()
-        tag = self._parsed.tag
-        if tag != 'map':
-            raise RuntimeError(f'{plugin_path!s}: invalid root element: {tag}')
+        # Single streaming pass: collect the top-level entries into a key -> values index
+        self._entries = dict()
+        depth = 0
+        for event, element in etree.iterparse(plugin_file, events=('start', 'end'), **parser_kwargs):
+            if event == 'start':
+                depth += 1
+                if depth == 1 and element.tag != 'map':
+                    raise RuntimeError(f'{plugin_path!s}: invalid root element: {element.tag}')
+            else:
+                depth -= 1
+                if depth == 1 and element.tag == 'entry' and len(element) > 1 and element[0].tag == 'string':
+                    self._entries.setdefault(element[0].text, list()).append(element[1])
 
     def get_aux_packages(self):
         key = 'plugin_aux_packages'
-        lst = [x[1] for x in self._parsed.findall('entry') if x[0].tag == 'string' and x[0].text == key]
+        lst = self._entries.get(key)
         if lst is None or len(lst) < 1:
             return []
         if len(lst) > 1:
@@ -112,9 +201,9 @@ class Plugin(object):
         return self._only_one('plugin_version', int)
 
     def _only_one(self, key, result=str):
-        lst = [x[1].text for x in self._parsed.findall('entry') if x[0].tag == 'string' and x[0].text == key]
+        lst = self._entries.get(key)
         if lst is None or len(lst) < 1:
             return None
         if len(lst) > 1:
             raise ValueError(f'plugin declares {len(lst)} entries for {key}')
-        return result(lst[0])
+        return result(lst[0].text)
@@ -28,8 +28,12 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import functools
 import importlib.resources
+import os
 from pathlib import Path
+import shlex
+import shutil
 import subprocess
 
 from lockss.turtles.plugin import Plugin
@@ -37,8 +41,18 @@ import lockss.turtles.resources
 from lockss.turtles.util import _load_and_validate, _path
 
 
+# The SELinux/chcon situation cannot change mid-run; probe at most once
+@functools.lru_cache(maxsize=1)
+def _selinux_chcon_available():
+    if shutil.which('selinuxenabled') is None or shutil.which('chcon') is None:
+        return False
+    return subprocess.run(['selinuxenabled']).returncode == 0
+
+
 class PluginRegistryCatalog(object):
 
+    __slots__ = ('_parsed',)
+
     PLUGIN_REGISTRY_CATALOG_SCHEMA = 'plugin-registry-catalog-schema.json'
 
     @staticmethod
@@ -58,6 +72,8 @@ class PluginRegistryCatalog(object):
 
 class PluginRegistry(object):
 
+    __slots__ = ('_layers', '_parsed', '_plugin_identifier_set')
+
     PLUGIN_REGISTRY_SCHEMA = 'plugin-registry-schema.json'
 
     @staticmethod
@@ -79,7 +95,9 @@ class PluginRegistry(object):
 
     def __init__(self, parsed):
         super().__init__()
+        self._layers = None
         self._parsed = parsed
+        self._plugin_identifier_set = frozenset(parsed['plugin-identifiers'])
 
     def get_id(self):
         return self._parsed['id']
@@ -94,7 +112,9 @@ class PluginRegistry(object):
         return [layer.get_id() for layer in self.get_layers()]
 
     def get_layers(self):
-        return [self._make_layer(layer_elem) for layer_elem in self._parsed['layers']]
+        if self._layers is None:
+            self._layers = [self._make_layer(layer_elem) for layer_elem in self._parsed['layers']]
+        return self._layers
 
     def get_layout_type(self):
         return self._parsed['layout']['type']
@@ -106,7 +126,7 @@ class PluginRegistry(object):
         return self._parsed['plugin-identifiers']
 
     def has_plugin(self, plugin_id):
-        return plugin_id in self.get_plugin_identifiers()
+        return plugin_id in self._plugin_identifier_set
 
     def _make_layer(self, parsed):
         raise NotImplementedError('_make_layer')
@@ -114,6 +134,8 @@ class PluginRegistry(object):
 
 class PluginRegistryLayer(object):
 
+    __slots__ = ('_parsed', '_path', '_plugin_registry')
+
     PRODUCTION = 'production'
 
     TESTING = 'testing'
@@ -121,10 +143,11 @@ class PluginRegistryLayer(object):
     def __init__(self, plugin_registry, parsed):
         super().__init__()
         self._parsed = parsed
+        self._path = None
         self._plugin_registry = plugin_registry
 
     # Returns (dst_path, plugin)
-    def deploy_plugin(self, plugin_id, jar_path, interactive=False):
+    def deploy_plugin(self, plugin_id, jar_path, interactive=False, plugin=None):
         raise NotImplementedError('deploy_plugin')
 
     def get_file_for(self, plugin_id):
@@ -140,7 +163,9 @@ class PluginRegistryLayer(object):
         return self._parsed['name']
 
     def get_path(self):
-        return _path(self._parsed['path'])
+        if self._path is None:
+            self._path = _path(self._parsed['path'])
+        return self._path
 
     def get_plugin_registry(self):
         return self._plugin_registry
@@ -148,6 +173,8 @@ class PluginRegistryLayer(object):
 
 class DirectoryPluginRegistry(PluginRegistry):
 
+    __slots__ = ()
+
     LAYOUT = 'directory'
 
     FILE_NAMING_CONVENTION_ABBREVIATED = 'abbreviated'
@@ -167,16 +194,20 @@ class DirectoryPluginRegistry(PluginRegistry):
 
 class DirectoryPluginRegistryLayer(PluginRegistryLayer):
 
+    __slots__ = ()
+
     def __init__(self, plugin_registry, parsed):
         super().__init__(plugin_registry, parsed)
 
-    def deploy_plugin(self, plugin_id, src_path, interactive=False):
+    def deploy_plugin(self, plugin_id, src_path, interactive=False, plugin=None):
         src_path = _path(src_path)  # in case it's a string
+        if plugin is None:
+            plugin = Plugin.from_jar(src_path)
         dst_path = self._get_dstpath(plugin_id)
         if not self._proceed_copy(src_path, dst_path, interactive=interactive):
             return None
-        self._copy_jar(src_path, dst_path, interactive=interactive)
-        return (dst_path, Plugin.from_jar(src_path))
+        self._copy_jar(src_path, dst_path, plugin, interactive=interactive)
+        return (dst_path, plugin)
 
     def get_file_for(self, plugin_id):
         jar_path = self._get_dstpath(plugin_id)
@@ -186,12 +217,15 @@ class DirectoryPluginRegistryLayer(PluginRegistryLayer):
         return self.get_plugin_registry()._parsed['layout'].get('file-naming-convention', DirectoryPluginRegistry.DEFAULT_FILE_NAMING_CONVENTION)
 
     def get_jars(self):
-        return sorted(self.get_path().glob('*.jar'))
+        # One scandir pass: entry.is_file() reads the directory entry's
+        # cached type instead of issuing a stat per JAR like glob would
+        with os.scandir(self.get_path()) as entries:
+            return sorted(Path(entry.path) for entry in entries if entry.name.endswith('.jar') and entry.is_file())
 
-    def _copy_jar(self, src_path, dst_path, interactive=False):
+    def _copy_jar(self, src_path, dst_path, plugin, interactive=False):
         basename = dst_path.name
-        subprocess.run(['cp', str(src_path), str(dst_path)], check=True, cwd=self.get_path())
-        if subprocess.run('command -v selinuxenabled > /dev/null && selinuxenabled && command -v chcon > /dev/null', shell=True).returncode == 0:
+        shutil.copy(src_path, dst_path)  # in-process; no 'cp' subprocess
+        if _selinux_chcon_available():
             cmd = ['chcon', '-t', 'httpd_sys_content_t', basename]
             subprocess.run(cmd, check=True, cwd=self.get_path())
 
@@ -220,6 +254,8 @@ class DirectoryPluginRegistryLayer(PluginRegistryLayer):
 
 class RcsPluginRegistry(DirectoryPluginRegistry):
 
+    __slots__ = ()
+
     LAYOUT = 'rcs'
 
     def __init__(self, parsed):
@@ -231,22 +267,28 @@ class RcsPluginRegistry(DirectoryPluginRegistry):
 
 class RcsPluginRegistryLayer(DirectoryPluginRegistryLayer):
 
+    __slots__ = ()
+
     def __init__(self, plugin_registry, parsed):
         super().__init__(plugin_registry, parsed)
 
-    def _copy_jar(self, src_path, dst_path, interactive=False):
+    def _copy_jar(self, src_path, dst_path, plugin, interactive=False):
         basename = dst_path.name
-        plugin = Plugin.from_jar(src_path)
         rcs_path = self.get_path().joinpath('RCS', f'{basename},v')
-        # Maybe do co -l before the parent's copy
+        # Assemble the whole co/cp/chcon/ci sequence into one shell invocation
+        # to amortize process creation over the deploy
+        script = list()
+        # Maybe do co -l before the copy
         if dst_path.exists() and rcs_path.is_file():
-            cmd = ['co', '-l', basename]
-            subprocess.run(cmd, check=True, cwd=self.get_path())
-        # Do the parent's copy
-        super()._copy_jar(src_path, dst_path)
-        # Do ci -u after the parent's copy
+            script.append(f'co -l {shlex.quote(basename)}')
+        # Do the copy
+        script.append(f'cp {shlex.quote(str(src_path))} {shlex.quote(str(dst_path))}')
+        if _selinux_chcon_available():
+            script.append(f'chcon -t httpd_sys_content_t {shlex.quote(basename)}')
+        # Do ci -u after the copy
         cmd = ['ci', '-u', f'-mVersion {plugin.get_version()}']
         if not rcs_path.is_file():
             cmd.append(f'-t-{plugin.get_name()}')
         cmd.append(basename)
-        subprocess.run(cmd, check=True, cwd=self.get_path())
+        script.append(' '.join([shlex.quote(c) for c in cmd]))
+        subprocess.run(' && '.join(script), shell=True, check=True, cwd=self.get_path())
@@ -34,6 +34,7 @@ from pathlib import Path
 import shlex
 import subprocess
 import sys
+import threading
 
 from lockss.turtles.plugin import Plugin
 import lockss.turtles.resources
@@ -42,6 +43,8 @@ from lockss.turtles.util import _load_and_validate, _path
 
 class PluginSetCatalog(object):
 
+    __slots__ = ('_parsed',)
+
     PLUGIN_SET_CATALOG_SCHEMA = 'plugin-set-catalog-schema.json'
 
     @staticmethod
@@ -61,6 +64,8 @@ class PluginSetCatalog(object):
 
 class PluginSet(object):
 
+    __slots__ = ('_parsed',)
+
     PLUGIN_SET_SCHEMA = 'plugin-set-schema.json'
 
     @staticmethod
@@ -106,6 +111,9 @@ class PluginSet(object):
 
 class AntPluginSet(PluginSet):
 
+    __slots__ = ('_built', '_build_lock', '_jars_path', '_known_plugin_files',
+                 '_main_path', '_plugin_cache', '_root', '_root_path', '_test_path')
+
     TYPE = 'ant'
 
     DEFAULT_MAIN = 'plugins/src'
@@ -115,7 +123,14 @@ class AntPluginSet(PluginSet):
     def __init__(self, parsed, path):
         super().__init__(parsed)
         self._built = False
+        self._build_lock = threading.Lock()
+        self._jars_path = None
+        self._known_plugin_files = None
+        self._main_path = None
+        self._plugin_cache = dict()
         self._root = path.parent
+        self._root_path = Path(self._root).expanduser().resolve()
+        self._test_path = None
 
     # Returns (jar_path, plugin)
     def build_plugin(self, plugin_id, keystore_path, keystore_alias, keystore_password=None):
@@ -131,32 +146,40 @@ class AntPluginSet(PluginSet):
         return self._parsed.get('main', AntPluginSet.DEFAULT_MAIN)
 
     def get_main_path(self):
-        return self.get_root_path().joinpath(self.get_main())
+        if self._main_path is None:
+            self._main_path = self.get_root_path().joinpath(self.get_main())
+        return self._main_path
 
     def get_root(self):
         return self._root
 
     def get_root_path(self):
-        return Path(self.get_root()).expanduser().resolve()
+        return self._root_path
 
     def get_test(self):
         return self._parsed.get('test', AntPluginSet.DEFAULT_TEST)
 
     def get_test_path(self):
-        return self.get_root_path().joinpath(self.get_test())
+        if self._test_path is None:
+            self._test_path = self.get_root_path().joinpath(self.get_test())
+        return self._test_path
 
     def has_plugin(self, plugin_id):
-        return self._plugin_path(plugin_id).is_file()
+        return str(self._plugin_path(plugin_id)) in self._plugin_files()
 
     def make_plugin(self, plugin_id):
-        return Plugin.from_path(self._plugin_path(plugin_id))
+        plugin = self._plugin_cache.get(plugin_id)
+        if plugin is None:
+            plugin = self._plugin_cache[plugin_id] = Plugin.from_path(self._plugin_path(plugin_id))
+        return plugin
 
     def _big_build(self):
-        if not self._built:
-            # Do build
-            subprocess.run('ant load-plugins',
-                           shell=True, cwd=self.get_root_path(), check=True, stdout=sys.stdout, stderr=sys.stderr)
-            self._built = True
+        with self._build_lock:
+            if not self._built:
+                # Do build
+                subprocess.run('ant load-plugins',
+                               shell=True, cwd=self.get_root_path(), check=True, stdout=sys.stdout, stderr=sys.stderr)
+                self._built = True
 
     # Returns (jar_path, plugin)
     def _little_build(self, plugin_id, keystore_path, keystore_alias, keystore_password=None):
@@ -164,44 +187,61 @@ class AntPluginSet(PluginSet):
         cur_id = plugin_id
         # Get all directories for jarplugin -d
         dirs = list()
+        seen_dirs = set()
         while cur_id is not None:
             cur_plugin = self.make_plugin(cur_id)
             orig_plugin = orig_plugin or cur_plugin
             cur_dir = Plugin.id_to_dir(cur_id)
-            if cur_dir not in dirs:
+            if cur_dir not in seen_dirs:
+                seen_dirs.add(cur_dir)
                 dirs.append(cur_dir)
             for aux_package in cur_plugin.get_aux_packages():
                 aux_dir = Plugin.id_to_dir(f'{aux_package}.FAKEPlugin')
-                if aux_dir not in dirs:
+                if aux_dir not in seen_dirs:
+                    seen_dirs.add(aux_dir)
                     dirs.append(aux_dir)
             cur_id = cur_plugin.get_parent_identifier()
         # Invoke jarplugin
         jar_fstr = Plugin.id_to_file(plugin_id)
-        jar_path = self.get_root_path().joinpath('plugins/jars', f'{plugin_id}.jar')
-        jar_path.parent.mkdir(parents=True, exist_ok=True)
+        if self._jars_path is None:
+            # Publish the attribute only after mkdir: concurrent little
+            # builds must never see the path before the directory exists
+            jars_path = self.get_root_path().joinpath('plugins', 'jars')
+            jars_path.mkdir(parents=True, exist_ok=True)
+            self._jars_path = jars_path
+        jar_path = self._jars_path.joinpath(f'{plugin_id}.jar')
         cmd = ['test/scripts/jarplugin',
-               '-j', str(jar_path),
-               '-p', str(jar_fstr)]
+               '-j', jar_path,
+               '-p', jar_fstr]
         for d in dirs:
             cmd.extend(['-d', d])
-        subprocess.run(cmd, cwd=self.get_root_path(), check=True, stdout=sys.stdout, stderr=sys.stderr)
+        # close_fds=False enables the posix_spawn fast path
+        subprocess.run(cmd, cwd=self.get_root_path(), check=True, close_fds=False, stdout=sys.stdout, stderr=sys.stderr)
         # Invoke signplugin
         cmd = ['test/scripts/signplugin',
-               '--jar', str(jar_path),
+               '--jar', jar_path,
                '--alias', keystore_alias,
-               '--keystore', str(keystore_path)]
+               '--keystore', keystore_path]
         if keystore_password is not None:
             cmd.extend(['--password', keystore_password])
         try:
-            subprocess.run(cmd, cwd=self.get_root_path(), check=True, stdout=sys.stdout, stderr=sys.stderr)
+            subprocess.run(cmd, cwd=self.get_root_path(), check=True, close_fds=False, stdout=sys.stdout, stderr=sys.stderr)
         except subprocess.CalledProcessError as cpe:
             raise self._sanitize(cpe)
         if not jar_path.is_file():
             raise FileNotFoundError(str(jar_path))
         return (jar_path, orig_plugin)
 
+    # Returns the set of file paths (as strings) under the main tree
+    def _plugin_files(self):
+        if self._known_plugin_files is None:
+            self._known_plugin_files = {os.path.join(dir_path, file_name)
+                                        for dir_path, dir_names, file_names in os.walk(self.get_main_path())
+                                        for file_name in file_names}
+        return self._known_plugin_files
+
     def _plugin_path(self, plugin_id):
-        return Path(self.get_main_path()).joinpath(Plugin.id_to_file(plugin_id))
+        return self.get_main_path().joinpath(Plugin.id_to_file(plugin_id))
 
     def _sanitize(self, called_process_error):
         cmd = called_process_error.cmd[:]
@@ -209,12 +249,15 @@ class AntPluginSet(PluginSet):
         for i in range(len(cmd)):
             if i > 1 and cmd[i - 1] == '--password':
                 cmd[i] = '<password>'
-        called_process_error.cmd = ' '.join([shlex.quote(c) for c in cmd])
+        called_process_error.cmd = ' '.join([shlex.quote(str(c)) for c in cmd])
         return called_process_error
 
 
 class MavenPluginSet(PluginSet):
 
+    __slots__ = ('_built', '_build_lock', '_known_plugin_files',
+                 '_main_path', '_plugin_cache', '_root', '_root_path', '_test_path')
+
     TYPE = 'maven'
 
     DEFAULT_MAIN = 'src/main/java'
@@ -224,7 +267,13 @@ class MavenPluginSet(PluginSet):
     def __init__(self, parsed, path):
         super().__init__(parsed)
         self._built = False
+        self._build_lock = threading.Lock()
+        self._known_plugin_files = None
+        self._main_path = None
+        self._plugin_cache = dict()
         self._root = path.parent
+        self._root_path = Path(self._root).expanduser().resolve()
+        self._test_path = None
 
     # Returns (jar_path, plugin)
     def build_plugin(self, plugin_id, keystore_path, keystore_alias, keystore_password=None):
@@ -235,38 +284,46 @@ class MavenPluginSet(PluginSet):
         return self._parsed.get('main', MavenPluginSet.DEFAULT_MAIN)
 
     def get_main_path(self):
-        return self.get_root_path().joinpath(self.get_main())
+        if self._main_path is None:
+            self._main_path = self.get_root_path().joinpath(self.get_main())
+        return self._main_path
 
     def get_root(self):
         return self._root
 
     def get_root_path(self):
-        return Path(self.get_root()).expanduser().resolve()
+        return self._root_path
 
     def get_test(self):
         return self._parsed.get('test', MavenPluginSet.DEFAULT_TEST)
 
     def get_test_path(self):
-        return self.get_root_path().joinpath(self.get_test())
+        if self._test_path is None:
+            self._test_path = self.get_root_path().joinpath(self.get_test())
+        return self._test_path
 
     def has_plugin(self, plugin_id):
-        return self._plugin_path(plugin_id).is_file()
+        return str(self._plugin_path(plugin_id)) in self._plugin_files()
 
     def make_plugin(self, plugin_id):
-        return Plugin.from_path(self._plugin_path(plugin_id))
+        plugin = self._plugin_cache.get(plugin_id)
+        if plugin is None:
+            plugin = self._plugin_cache[plugin_id] = Plugin.from_path(self._plugin_path(plugin_id))
+        return plugin
 
     def _big_build(self, keystore_path, keystore_alias, keystore_password=None):
-        if not self._built:
-            # Do build
-            cmd = ['mvn', 'package',
-                   f'-Dkeystore.file={keystore_path!s}',
-                   f'-Dkeystore.alias={keystore_alias}',
-                   f'-Dkeystore.password={keystore_password}']
-            try:
-                subprocess.run(cmd, cwd=self.get_root_path(), check=True, stdout=sys.stdout, stderr=sys.stderr)
-            except subprocess.CalledProcessError as cpe:
-                raise self._sanitize(cpe)
-            self._built = True
+        with self._build_lock:
+            if not self._built:
+                # Do build
+                cmd = ['mvn', 'package',
+                       f'-Dkeystore.file={keystore_path!s}',
+                       f'-Dkeystore.alias={keystore_alias}',
+                       f'-Dkeystore.password={keystore_password}']
+                try:
+                    subprocess.run(cmd, cwd=self.get_root_path(), check=True, stdout=sys.stdout, stderr=sys.stderr)
+                except subprocess.CalledProcessError as cpe:
+                    raise self._sanitize(cpe)
+                self._built = True
 
     # Returns (jar_path, plugin)
     def _little_build(self, plugin_id):
@@ -275,8 +332,16 @@ class MavenPluginSet(PluginSet):
             raise Exception(f'{plugin_id}: built JAR not found: {jar_path!s}')
         return (jar_path, Plugin.from_jar(jar_path))
 
+    # Returns the set of file paths (as strings) under the main tree
+    def _plugin_files(self):
+        if self._known_plugin_files is None:
+            self._known_plugin_files = {os.path.join(dir_path, file_name)
+                                        for dir_path, dir_names, file_names in os.walk(self.get_main_path())
+                                        for file_name in file_names}
+        return self._known_plugin_files
+
     def _plugin_path(self, plugin_id):
-        return Path(self.get_main_path()).joinpath(Plugin.id_to_file(plugin_id))
+        return self.get_main_path().joinpath(Plugin.id_to_file(plugin_id))
 
     def _sanitize(self, called_process_error):
         cmd = called_process_error.cmd[:]
@@ -28,19 +28,28 @@
 # ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
 # POSSIBILITY OF SUCH DAMAGE.
 
+import functools
 from pathlib import Path, PurePath
-import json
-
-import jsonschema
-import jsonschema.exceptions
-import yaml
 
 
 def _load_and_validate(schema_path, instance_path, multiple=False):
+    return _load_and_validate_cached(schema_path, instance_path, instance_path.stat().st_mtime_ns, multiple)
+
+
+# Cached on the instance file's mtime so batch commands that revisit the
+# same config files parse and validate each one once
+@functools.lru_cache(maxsize=64)
+def _load_and_validate_cached(schema_path, instance_path, mtime_ns, multiple):
+    # Deferred imports: keep json/jsonschema off the cold-start path
+    import json
+    import jsonschema
+    import jsonschema.exceptions
     with schema_path.open('r') as f:
         schema = json.load(f)
-    with instance_path.open('r') as f:
-        ret = list(yaml.safe_load_all(f) if multiple else [yaml.safe_load(f)])
+    ret = _read_json_sidecar(instance_path, mtime_ns, multiple)
+    if ret is None:
+        ret = _load_yaml(instance_path, multiple)
+        _write_json_sidecar(instance_path, mtime_ns, multiple, ret)
     for instance in ret:
         try:
             jsonschema.validate(instance, schema)
@@ -49,7 +58,72 @@ def _load_and_validate(schema_path, instance_path, multiple=False):
     return ret if multiple else ret[0]
 
 
+def _load_yaml(instance_path, multiple):
+    import mmap
+    import yaml
+    with instance_path.open('rb') as f:
+        try:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # zero-length files cannot be mapped
+            buf = f.read()
+        loader = getattr(yaml, 'CSafeLoader', None)  # libyaml when available
+        if loader is None:
+            import warnings
+            warnings.warn('libyaml is not available; falling back to the slower pure-Python YAML loader')
+            loader = yaml.SafeLoader
+        try:
+            return list(yaml.load_all(buf, Loader=loader) if multiple else [yaml.load(buf, Loader=loader)])
+        finally:
+            if isinstance(buf, mmap.mmap):
+                buf.close()
+
+
+# Returns the cached parse of the given configuration file, or None if there
+# is no sidecar or the sidecar is out of date
+def _read_json_sidecar(instance_path, mtime_ns, multiple):
+    import json
+    try:
+        with _sidecar_path(instance_path).open('r') as f:
+            cached = json.load(f)
+        if cached.get('mtime_ns') == mtime_ns and cached.get('multiple') == multiple:
+            return cached['data']
+    except (OSError, ValueError, KeyError):
+        pass
+    return None
+
+
+# Parsed YAML is cached as JSON in the user's XDG cache directory (loading
+# JSON is much faster than loading YAML); one file per configuration file,
+# named after the hash of its resolved path, invalidated by mtime
+def _sidecar_path(instance_path):
+    import hashlib
+    import xdg
+    digest = hashlib.sha256(str(instance_path).encode('utf-8')).hexdigest()[:32]
+    return xdg.xdg_cache_home().joinpath(__package__, f'{digest}.json')
+
+
+# Best effort: an unwritable cache directory or non-JSON-representable
+# document just means the YAML is re-parsed next run
+def _write_json_sidecar(instance_path, mtime_ns, multiple, data):
+    import json
+    import os
+    sidecar_path = _sidecar_path(instance_path)
+    try:
+        sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = sidecar_path.with_suffix(f'.{os.getpid()}.tmp')
+        with tmp_path.open('w') as f:
+            json.dump({'source': str(instance_path), 'mtime_ns': mtime_ns, 'multiple': multiple, 'data': data}, f)
+        os.replace(tmp_path, sidecar_path)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
 def _path(purepath_or_string):
-    if not issubclass(type(purepath_or_string), PurePath):
-        purepath_or_string = Path(purepath_or_string)
-    return purepath_or_string.expanduser().resolve()
+    return _resolve_str(str(purepath_or_string))
+
+
+# resolve() stats every path component; the same files and prefixes recur
+# constantly within one run, so remember the answers
+@functools.lru_cache(maxsize=256)
+def _resolve_str(path_str):
+    return Path(path_str).expanduser().resolve()
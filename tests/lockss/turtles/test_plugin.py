@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+# Copyright (c) 2000-2024, Board of Trustees of Leland Stanford Jr. University
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+#
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+#
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+import io
+from pathlib import Path
+import tempfile
+import unittest
+import zipfile
+
+from lockss.turtles.plugin import Plugin
+
+
+class TestPlugin(unittest.TestCase):
+
+    def test_comments_ignored(self):
+        # Comments must not count as entry children, whether the parser is
+        # stock ElementTree (which discards them) or lxml (which keeps them)
+        plugin = Plugin(io.BytesIO(b'''\
+<map>
+  <!-- top-level comment -->
+  <entry>
+    <!-- comment before the key -->
+    <string>plugin_version</string>
+    <string>5</string>
+  </entry>
+  <entry>
+    <string>plugin_identifier</string>
+    <!-- comment between key and value -->
+    <string>com.example.FooPlugin</string>
+  </entry>
+  <entry>
+    <string>plugin_name</string>
+    <string>Foo</string><!-- trailing comment -->
+  </entry>
+</map>
+'''), 'test_comments_ignored')
+        self.assertEqual(plugin.get_identifier(), 'com.example.FooPlugin')
+        self.assertEqual(plugin.get_name(), 'Foo')
+        self.assertEqual(plugin.get_version(), 5)
+        self.assertIsNone(plugin.get_parent_identifier())
+
+
+class TestManifest(unittest.TestCase):
+
+    PLUGIN_XML = b'''\
+<map>
+  <entry>
+    <string>plugin_identifier</string>
+    <string>edu.example.verylongpackagename.evenlongersubpackage.SomeVeryLongNamePlugin</string>
+  </entry>
+  <entry>
+    <string>plugin_version</string>
+    <string>3</string>
+  </entry>
+</map>
+'''
+
+    def test_continuation_line(self):
+        # Name header folded at the 72-byte manifest line limit
+        manifest = ('Manifest-Version: 1.0\r\n'
+                    '\r\n'
+                    'Name: edu/example/verylongpackagename/evenlongersubpackage/SomeVeryLo\r\n'
+                    ' ngNamePlugin.xml\r\n'
+                    'Lockss-Plugin: true\r\n'
+                    '\r\n')
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jar_path = self._make_jar(temp_dir, manifest,
+                                      plugin_fstr='edu/example/verylongpackagename/evenlongersubpackage/SomeVeryLongNamePlugin.xml')
+            self.assertEqual(Plugin.id_from_jar(jar_path),
+                             'edu.example.verylongpackagename.evenlongersubpackage.SomeVeryLongNamePlugin')
+            self.assertEqual(Plugin.from_jar(jar_path).get_version(), 3)
+
+    def test_crlf_and_lf_line_endings(self):
+        for newline in ('\r\n', '\n'):
+            with self.subTest(newline=repr(newline)):
+                manifest = newline.join(['Manifest-Version: 1.0',
+                                         '',
+                                         'Name: a/b/CPlugin.xml',
+                                         'Lockss-Plugin: true',
+                                         ''])
+                with tempfile.TemporaryDirectory() as temp_dir:
+                    jar_path = self._make_jar(temp_dir, manifest, plugin_fstr='a/b/CPlugin.xml')
+                    self.assertEqual(Plugin.id_from_jar(jar_path), 'a.b.CPlugin')
+
+    def test_no_lockss_plugin_entry(self):
+        manifest = ('Manifest-Version: 1.0\r\n'
+                    '\r\n'
+                    'Name: a/b/CPlugin.xml\r\n'
+                    '\r\n')
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jar_path = self._make_jar(temp_dir, manifest)
+            self.assertRaisesRegex(Exception,
+                                   'no Lockss-Plugin entry',
+                                   Plugin.id_from_jar,
+                                   jar_path)
+
+    def test_no_name(self):
+        manifest = ('Manifest-Version: 1.0\r\n'
+                    '\r\n'
+                    'Lockss-Plugin: true\r\n'
+                    '\r\n')
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jar_path = self._make_jar(temp_dir, manifest)
+            self.assertRaisesRegex(Exception,
+                                   'has no Name value',
+                                   Plugin.id_from_jar,
+                                   jar_path)
+
+    def test_parse_manifest(self):
+        sections = Plugin._parse_manifest('Manifest-Version: 1.0\r\n'
+                                          'Created-By: test\r\n'
+                                          '\r\n'
+                                          'Name: a/b/CPl\r\n'
+                                          ' ugin.xml\r\n'
+                                          'Lockss-Plugin: true\r\n'
+                                          '\r\n'
+                                          'Name: a/b/other.xml\r\n'
+                                          '\r\n')
+        self.assertEqual(sections, [{'Manifest-Version': '1.0', 'Created-By': 'test'},
+                                    {'Name': 'a/b/CPlugin.xml', 'Lockss-Plugin': 'true'},
+                                    {'Name': 'a/b/other.xml'}])
+
+    def _make_jar(self, temp_dir, manifest_str, plugin_fstr=None):
+        jar_path = Path(temp_dir, 'test.jar')
+        with zipfile.ZipFile(jar_path, 'w') as zip_file:
+            zip_file.writestr('META-INF/MANIFEST.MF', manifest_str)
+            if plugin_fstr is not None:
+                zip_file.writestr(plugin_fstr, TestManifest.PLUGIN_XML)
+        return jar_path
+
+
+if __name__ == '__main__':
+    unittest.main()